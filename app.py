@@ -1,17 +1,250 @@
-from flask import Flask, render_template, request
+from flask import (Flask, Response, g, has_request_context, jsonify, make_response, render_template,
+                   request, stream_with_context)
+from markupsafe import Markup
+from werkzeug.http import is_resource_modified
+import click
 import sqlite3
+import csv
+import io
 import random
 import math
+import multiprocessing
+import os
+import queue
+import re
+import secrets
+import struct
+import threading
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
 import hashlib
+import json
 import base64
+import cProfile
+import pstats
+import time
+import zlib
+import atexit
+from bisect import bisect_left
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from itertools import islice
 
 app = Flask(__name__)
 
+# ---------- METRICS ----------
+# Instrumentasi opsional (METRICS_ENABLED=1). Saat mati, timed() hanya
+# mengembalikan context manager kosong dan pembungkus cipher langsung
+# memanggil fungsi aslinya.
+app.config["METRICS"] = os.environ.get("METRICS_ENABLED") == "1"
+app.config["METRICS_PROFILE"] = os.environ.get("METRICS_PROFILE") == "1"
+METRIC_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metrics:
+    """Histogram latensi dan counter sederhana dengan output format Prometheus."""
+
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            hist = self._histograms.setdefault(name, {}).get(labels)
+            if hist is None:
+                # [jumlah per bucket..., +Inf], total nilai
+                hist = self._histograms[name][labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            hist[0][bisect_left(self.buckets, value)] += 1
+            hist[1] += value
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, (counts, total) in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + ("+Inf",), counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(labels)} {total}")
+                    lines.append(f"{name}_count{self._labels(labels)} {cumulative}")
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+metrics.describe("kripto_phase_seconds", "Latensi per route dan fase (db, select, insert, cipher, batch, render, total)")
+metrics.describe("kripto_cipher_seconds", "Latensi fungsi cipher")
+metrics.describe("kripto_cipher_bytes_total", "Jumlah byte UTF-8 yang diproses per cipher")
+
+class _PhaseTimer:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        route = request.endpoint if has_request_context() else "-"
+        metrics.observe("kripto_phase_seconds", (("route", route), ("phase", self.phase)),
+                        time.perf_counter() - self.start)
+
+_NO_TIMER = nullcontext()
+
+def timed(phase):
+    """Context manager untuk mengukur satu fase request."""
+    if not app.config["METRICS"]:
+        return _NO_TIMER
+    return _PhaseTimer(phase)
+
+def _utf8_len(text):
+    # isascii() tidak menyalin string, jadi encode hanya untuk teks non-ASCII
+    return len(text) if text.isascii() else len(text.encode("utf-8", "surrogatepass"))
+
+def _text_size(args, result):
+    # ukuran teks: input jika string, selain itu output (misalnya dekripsi RSA)
+    if args and isinstance(args[0], str):
+        return _utf8_len(args[0])
+    return _utf8_len(result) if isinstance(result, str) else 0
+
+def _batch_size(args, result):
+    return sum(_utf8_len(text) for text, _ in args[0])
+
+def instrument_cipher(cipher, op, size=_text_size):
+    """Decorator: mencatat latensi dan jumlah byte yang diproses fungsi cipher."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not app.config["METRICS"]:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            labels = (("cipher", cipher), ("op", op))
+            metrics.observe("kripto_cipher_seconds", labels, elapsed)
+            metrics.inc("kripto_cipher_bytes_total", labels, size(args, result))
+            if has_request_context():
+                metrics.observe("kripto_phase_seconds",
+                                (("route", request.endpoint), ("phase", "cipher")), elapsed)
+            return result
+        return wrapper
+    return decorator
+
+@app.before_request
+def _start_request_timer():
+    if app.config["METRICS"]:
+        g.request_start = time.perf_counter()
+    if app.config["METRICS_PROFILE"] and request.args.get("_profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def _finish_request_timer(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(40)
+        return Response(out.getvalue(), mimetype="text/plain")
+    start = g.pop("request_start", None)
+    if start is not None:
+        metrics.observe("kripto_phase_seconds", (("route", request.endpoint or "-"), ("phase", "total")),
+                        time.perf_counter() - start)
+    return response
+
 # ---------- DATABASE ----------
+app.config["DATABASE"] = os.environ.get("MAHASISWA_DB", "mahasiswa.db")
+app.config["DB_POOL_SIZE"] = int(os.environ.get("MAHASISWA_DB_POOL", 8))
+PAGE_SIZE = 50
+
+# pool koneksi dipakai bersama oleh semua thread worker
+_db_pool = queue.LifoQueue(maxsize=app.config["DB_POOL_SIZE"])
+
+def _connect():
+    conn = sqlite3.connect(app.config["DATABASE"],
+                           check_same_thread=False, cached_statements=256)
+    # WAL: pembaca tidak diblok penulis, NORMAL cukup aman untuk WAL
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+# path database yang skemanya sudah dipastikan ada oleh proses ini
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+def ensure_schema():
+    """Menjalankan init_db() sekali per proses dan path database.
+
+    Perlu untuk `flask run`/gunicorn yang tidak melewati blok __main__;
+    tanpa ini tabel table_version dan index NOCASE tidak pernah dibuat.
+    """
+    path = app.config["DATABASE"]
+    if path in _schema_ready:
+        return
+    with _schema_lock:
+        if path not in _schema_ready:
+            init_db()
+            _schema_ready.add(path)
+
+def get_db():
+    """Mengambil koneksi dari pool untuk request yang sedang berjalan."""
+    if "db" not in g:
+        ensure_schema()
+        with timed("db"):
+            try:
+                g.db = _db_pool.get_nowait()
+            except queue.Empty:
+                g.db = _connect()
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exc):
+    conn = g.pop("db", None)
+    if conn is None:
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
 def init_db():
-    conn = sqlite3.connect("mahasiswa.db")
+    conn = _connect()
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS mahasiswa (
@@ -22,112 +255,677 @@ def init_db():
             password TEXT
         )
     """)
+    # index NOCASE supaya pencarian prefix dengan LIKE bisa memakai index
+    c.execute("CREATE INDEX IF NOT EXISTS idx_mahasiswa_nim ON mahasiswa (nim COLLATE NOCASE)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_mahasiswa_nama ON mahasiswa (nama COLLATE NOCASE)")
+    # versi tabel dipakai untuk cache fragmen dan ETag; dinaikkan sekali per
+    # transaksi tulis (bump_table_version), bukan per baris lewat trigger
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS table_version (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+    """)
+    c.execute("INSERT OR IGNORE INTO table_version VALUES ('mahasiswa', 0, strftime('%s', 'now'))")
+    for event in ("insert", "update", "delete"):
+        c.execute(f"DROP TRIGGER IF EXISTS mahasiswa_version_{event}")
     conn.commit()
     conn.close()
 
-# ---------- ZIGZAG CIPHER ----------
-def encrypt_rail_fence(text, key):
-    rail = [['\n' for _ in range(len(text))] for _ in range(key)]
-    dir_down = False
-    row, col = 0, 0
+INSERT_MAHASISWA = "INSERT INTO mahasiswa (nama, nim, jk, password) VALUES (?, ?, ?, ?)"
+
+def bump_table_version(conn):
+    """Menaikkan versi tabel mahasiswa di dalam transaksi tulis yang sedang berjalan.
+
+    Setiap penulisan ke mahasiswa harus memanggil ini sebelum commit. Trigger
+    per baris dulu menambah 45-75% waktu insert massal; perubahan dari luar
+    aplikasi (sqlite3 CLI) perlu menaikkan table_version sendiri.
+    """
+    conn.execute("UPDATE table_version SET version = version + 1, updated_at = strftime('%s', 'now') "
+                 "WHERE name = 'mahasiswa'")
+
+def insert_mahasiswa(nama, nim, jk, password):
+    """Menyimpan satu baris mahasiswa ke database.
+
+    Dengan WRITE_BEHIND aktif, baris hanya dimasukkan ke antrean writer dan
+    dicatat di g supaya halaman yang sedang dirender tetap menampilkannya.
+    """
+    row = (nama, nim, jk, password)
+    if write_behind is not None:
+        with timed("insert"):
+            g.write_seq = write_behind.submit(row)
+        g.setdefault("pending_rows", []).append(row)
+        return
+    conn = get_db()
+    with timed("insert"), conn:
+        conn.execute(INSERT_MAHASISWA, row)
+        bump_table_version(conn)
+
+# ---------- WRITE-BEHIND ----------
+# Antrean write-behind ada di memori tiap proses, jadi read-your-writes hanya
+# dijamin jika server berjalan dengan satu proses worker (thread boleh banyak).
+app.config["WRITE_BEHIND"] = os.environ.get("WRITE_BEHIND") == "1"
+app.config["WRITE_BEHIND_BATCH"] = int(os.environ.get("WRITE_BEHIND_BATCH", 256))
+app.config["WRITE_BEHIND_INTERVAL"] = float(os.environ.get("WRITE_BEHIND_INTERVAL", 0.05))
+app.config["WRITE_BEHIND_WAIT"] = float(os.environ.get("WRITE_BEHIND_WAIT", 2.0))
+
+class WriteBehindWriter:
+    """Menulis baris mahasiswa dari satu thread dengan group commit.
+
+    Baris dikumpulkan sampai batch_size baris atau interval detik sejak
+    baris pertama, lalu disimpan dengan satu executemany + commit. Setiap
+    baris mendapat nomor urut sehingga pemanggil bisa menunggu sampai
+    barisnya selesai diproses (wait_for) lalu memeriksa apakah barisnya
+    gagal disimpan (failed).
+    """
+
+    def __init__(self, batch_size, interval):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._done = 0
+        # rentang (seq pertama, seq terakhir) batch yang gagal disimpan
+        self._failed = deque(maxlen=1024)
+        self._thread = None
+        self._closed = False
+
+    def submit(self, row):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Writer sudah ditutup")
+            if self._thread is None or not self._thread.is_alive():
+                # thread dibuat saat dipakai, bukan saat import (aman untuk server yang fork),
+                # dan dibuat ulang jika thread sebelumnya mati
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._submitted += 1
+            self._queue.put((self._submitted, row))
+            return self._submitted
+
+    def _run(self):
+        conn = None
+        try:
+            ensure_schema()
+            conn = _connect()
+            self._loop(conn)
+        except Exception:
+            app.logger.exception("thread write-behind berhenti")
+            self._abort()
+        finally:
+            if conn is not None:
+                conn.close()
 
-    for char in text:
-        if row == 0 or row == key - 1:
-            dir_down = not dir_down
-        rail[row][col] = char
-        col += 1
-        row += 1 if dir_down else -1
+    def _loop(self, conn):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(conn, batch)
+
+    def _write(self, conn, batch):
+        failed = False
+        try:
+            with conn:
+                conn.executemany(INSERT_MAHASISWA, [row for _, row in batch])
+                bump_table_version(conn)
+        except sqlite3.Error:
+            app.logger.exception("write-behind gagal menyimpan %d baris", len(batch))
+            failed = True
+        with self._cond:
+            if failed:
+                self._failed.append((batch[0][0], batch[-1][0]))
+            self._done = batch[-1][0]
+            self._cond.notify_all()
+
+    def _abort(self):
+        # thread mati: semua baris yang belum diproses dianggap gagal, dan
+        # submit berikutnya membuat thread baru
+        with self._cond:
+            self._thread = None
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if self._submitted > self._done:
+                self._failed.append((self._done + 1, self._submitted))
+                self._done = self._submitted
+            self._cond.notify_all()
+
+    def wait_for(self, seq, timeout=None):
+        """Menunggu sampai baris bernomor seq selesai diproses (tersimpan atau gagal)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._done >= seq, timeout)
+
+    def failed(self, seq):
+        """True jika baris bernomor seq gagal disimpan."""
+        with self._cond:
+            return any(first <= seq <= last for first, last in self._failed)
+
+    def flush(self, timeout=None):
+        with self._cond:
+            seq = self._submitted
+        return self.wait_for(seq, timeout)
+
+    def close(self):
+        """Menyimpan semua baris yang masih antre lalu menghentikan thread."""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+write_behind = None
+if app.config["WRITE_BEHIND"]:
+    write_behind = WriteBehindWriter(app.config["WRITE_BEHIND_BATCH"], app.config["WRITE_BEHIND_INTERVAL"])
+    atexit.register(write_behind.close)
+
+WRITE_COOKIE = "wb_seq"
+_warned_other_worker = False
+
+def wait_for_own_writes():
+    """Read-your-writes: tunggu baris yang dikirim klien ini di request sebelumnya.
+
+    Cookie berisi pid:seq, jadi jaminan ini berlaku per proses worker.
+    Mengembalikan pesan error jika baris itu gagal, belum sempat disimpan,
+    atau diantre oleh proses worker lain yang antreannya tidak bisa ditunggu.
+    """
+    global _warned_other_worker
+    if write_behind is None:
+        return None
+    pid, _, seq = request.cookies.get(WRITE_COOKIE, "").partition(":")
+    if not pid.isdigit() or not seq.isdigit():
+        return None
+    if pid != str(os.getpid()):
+        if not _warned_other_worker:
+            _warned_other_worker = True
+            app.logger.warning("WRITE_BEHIND aktif dengan lebih dari satu proses worker; "
+                               "read-your-writes tidak dijamin, jalankan satu worker atau matikan WRITE_BEHIND")
+        g.clear_write_seq = True
+        return "Data terakhir diantre oleh proses server lain dan mungkin belum tampil, muat ulang sebentar lagi"
+    if not write_behind.wait_for(int(seq), app.config["WRITE_BEHIND_WAIT"]):
+        return "Data terakhir belum selesai disimpan, muat ulang halaman sebentar lagi"
+    if write_behind.failed(int(seq)):
+        # cukup dilaporkan sekali
+        g.clear_write_seq = True
+        return "Data terakhir gagal disimpan ke database"
+    return None
+
+@app.after_request
+def _remember_write_seq(response):
+    seq = g.pop("write_seq", None)
+    if seq is not None:
+        response.set_cookie(WRITE_COOKIE, f"{os.getpid()}:{seq}", max_age=60, httponly=True, samesite="Lax")
+    elif g.pop("clear_write_seq", False):
+        response.delete_cookie(WRITE_COOKIE, httponly=True, samesite="Lax")
+    return response
+
+def _like_prefix(text):
+    text = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return text + "%"
+
+def list_mahasiswa(after=None, q=None, jk=None, limit=PAGE_SIZE):
+    """Mengambil satu halaman data mahasiswa dengan keyset pagination.
+
+    Mengembalikan (rows, next_after); next_after bernilai None jika
+    sudah halaman terakhir.
+    """
+    clauses, params = [], []
+    if after is not None:
+        clauses.append("id > ?")
+        params.append(after)
+    if q:
+        clauses.append("(nama LIKE ? ESCAPE '\\' OR nim LIKE ? ESCAPE '\\')")
+        params += [_like_prefix(q), _like_prefix(q)]
+    if jk:
+        clauses.append("jk = ?")
+        params.append(jk)
+
+    sql = "SELECT id, nama, nim, jk, password FROM mahasiswa"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id LIMIT ?"
+    # ambil satu baris lebih untuk tahu apakah masih ada halaman berikutnya
+    params.append(limit + 1)
+
+    conn = get_db()
+    with timed("select"):
+        rows = conn.execute(sql, params).fetchall()
+
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_after = rows[-1][0]
+    return rows, next_after
+
+def get_table_version():
+    """Mengembalikan (versi, waktu perubahan terakhir) tabel mahasiswa."""
+    row = get_db().execute("SELECT version, updated_at FROM table_version WHERE name = 'mahasiswa'").fetchone()
+    if row is None:
+        return None, None
+    return row[0], datetime.fromtimestamp(row[1], timezone.utc)
+
+FRAGMENT_CACHE_SIZE = 256
+_fragment_cache = OrderedDict()
+_fragment_cache_lock = threading.Lock()
+# berubah jika template diubah, supaya ETag lama tidak dianggap masih valid
+_TEMPLATE_STAMP = max(int(os.path.getmtime(os.path.join(app.root_path, app.template_folder, name)))
+                      for name in os.listdir(os.path.join(app.root_path, app.template_folder)))
+
+def render_mahasiswa_table(version, after, q, jk, pending=()):
+    """Render fragmen tabel mahasiswa; hasil di-cache per versi tabel dan parameter halaman.
+
+    pending berisi baris write-behind milik request ini yang belum di-commit;
+    fragmen dengan baris pending tidak di-cache.
+    """
+    key = (version, after, q, jk)
+    cacheable = version is not None and not pending
+    if cacheable:
+        with _fragment_cache_lock:
+            fragment = _fragment_cache.get(key)
+            if fragment is not None:
+                _fragment_cache.move_to_end(key)
+                return fragment
+
+    mahasiswa_list, next_after = list_mahasiswa(after=after, q=q or None, jk=jk or None)
+    if pending and next_after is None and not q and not jk:
+        mahasiswa_list = mahasiswa_list + [("*",) + row for row in pending]
+    with timed("render"):
+        fragment = Markup(render_template("_mahasiswa_table.html", mahasiswa=mahasiswa_list,
+                                          next_after=next_after, after=after, q=q, jk=jk))
+    if cacheable:
+        with _fragment_cache_lock:
+            _fragment_cache[key] = fragment
+            if len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+                _fragment_cache.popitem(last=False)
+    return fragment
+
+def render_with_mahasiswa(template, **context):
+    """Render halaman cipher beserta satu halaman tabel mahasiswa.
+
+    GET diberi ETag/Last-Modified dari versi tabel, sehingga request ulang
+    saat tabel belum berubah dijawab 304 tanpa query maupun render.
+    """
+    after = request.args.get("after", type=int)
+    q = request.args.get("q", "").strip()
+    jk = request.args.get("jk", "").strip()
+    write_error = wait_for_own_writes()
+    if write_error:
+        context["error"] = context.get("error") or write_error
+    version, updated_at = get_table_version()
+
+    conditional = request.method == "GET" and version is not None and not write_error
+    if conditional:
+        etag = f"{version}-{_TEMPLATE_STAMP}-{request.endpoint}-{zlib.crc32(request.query_string):x}"
+        if not is_resource_modified(request.environ, etag=etag, last_modified=updated_at):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+    fragment = render_mahasiswa_table(version, after, q, jk, g.get("pending_rows", ()))
+    with timed("render"):
+        response = make_response(render_template(template, mahasiswa_table=fragment, **context))
+    if conditional:
+        response.set_etag(etag)
+        response.last_modified = updated_at
+        response.cache_control.no_cache = True
+    return response
 
-    result = []
-    for i in range(key):
-        for j in range(len(text)):
-            if rail[i][j] != '\n':
-                result.append(rail[i][j])
-    return "".join(result)
+# ---------- ZIGZAG CIPHER ----------
+# Posisi rail tiap karakter dihitung langsung dari indeksnya: pola zigzag
+# berulang setiap cycle = 2 * (key - 1) karakter, dan rail r berisi
+# karakter dengan indeks i % cycle == r atau i % cycle == cycle - r.
+def _check_rail(key):
+    if key < 1:
+        raise ValueError("Jumlah rail minimal 1")
+
+def _rail_residues(r, key):
+    cycle = 2 * (key - 1)
+    if r == 0 or r == key - 1:
+        return (r,)
+    return (r, cycle - r)
+
+def _chunk_rails(start, end, key):
+    """Rail yang berisi karakter dengan indeks start..end-1.
+
+    Potongan sepanjang satu cycle atau lebih menyentuh semua rail; potongan
+    yang lebih pendek hanya menyentuh paling banyak end - start rail, jadi
+    biayanya ikut panjang teks, bukan jumlah rail.
+    """
+    cycle = 2 * (key - 1)
+    if end - start >= cycle:
+        return range(key)
+    return sorted({min(i % cycle, cycle - i % cycle) for i in range(start, end)})
+
+def _interleave(a, b):
+    # a mengisi posisi genap, b posisi ganjil (len(a) == len(b) atau len(b) + 1)
+    merged = [None] * (len(a) + len(b))
+    merged[0::2] = a
+    merged[1::2] = b
+    return "".join(merged)
+
+def iter_encrypt_rail_fence(chunks, key):
+    """Enkripsi rail fence untuk teks yang dibaca per potongan.
+
+    Menerima iterable berisi potongan teks dan menghasilkan isi tiap rail
+    secara berurutan; digabung hasilnya sama dengan encrypt_rail_fence.
+    """
+    _check_rail(key)
+    if key == 1:
+        for chunk in chunks:
+            yield chunk
+        return
+
+    cycle = 2 * (key - 1)
+    # rail dibuat saat pertama kali terisi; teks sepanjang n hanya mencapai rail n - 1
+    rails = []
+    offset = 0
+    for chunk in chunks:
+        touched = _chunk_rails(offset, offset + len(chunk), key)
+        if touched and touched[-1] >= len(rails):
+            rails.extend([] for _ in range(touched[-1] + 1 - len(rails)))
+        for r in touched:
+            starts = sorted((res - offset) % cycle for res in _rail_residues(r, key))
+            if len(starts) == 1:
+                rails[r].append(chunk[starts[0]::cycle])
+            else:
+                rails[r].append(_interleave(chunk[starts[0]::cycle], chunk[starts[1]::cycle]))
+        offset += len(chunk)
+
+    for rail in rails:
+        yield "".join(rail)
+
+def iter_decrypt_rail_fence(cipher, key, chunk_size=65536):
+    """Dekripsi rail fence yang menghasilkan plaintext per potongan chunk_size."""
+    _check_rail(key)
+    if key == 1:
+        for start in range(0, len(cipher), chunk_size):
+            yield cipher[start:start + chunk_size]
+        return
+
+    n = len(cipher)
+    # rail di atas n - 1 selalu kosong, jadi hasilnya sama dengan key = n
+    key = min(key, max(n, 2))
+    cycle = 2 * (key - 1)
+
+    def count_before(r, pos):
+        # banyaknya karakter rail r yang indeksnya < pos
+        return sum(len(range(res, pos, cycle)) for res in _rail_residues(r, key))
+
+    # awal segmen tiap rail di dalam ciphertext
+    rail_start = [0] * key
+    for r in range(1, key):
+        rail_start[r] = rail_start[r - 1] + count_before(r - 1, n)
+
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        out = [None] * (end - start)
+        for r in _chunk_rails(start, end, key):
+            seg = cipher[rail_start[r] + count_before(r, start):rail_start[r] + count_before(r, end)]
+            starts = sorted((res - start) % cycle for res in _rail_residues(r, key))
+            if len(starts) == 1:
+                out[starts[0]::cycle] = seg
+            else:
+                out[starts[0]::cycle] = seg[0::2]
+                out[starts[1]::cycle] = seg[1::2]
+        yield "".join(out)
+
+@instrument_cipher("zigzag", "encrypt")
+def encrypt_rail_fence(text, key):
+    return "".join(iter_encrypt_rail_fence([text], key))
 
+@instrument_cipher("zigzag", "decrypt")
 def decrypt_rail_fence(cipher, key):
-    rail = [['\n' for _ in range(len(cipher))] for _ in range(key)]
-    dir_down = None
-    row, col = 0, 0
-
-    for _ in range(len(cipher)):
-        if row == 0:
-            dir_down = True
-        if row == key - 1:
-            dir_down = False
-        rail[row][col] = '*'
-        col += 1
-        row += 1 if dir_down else -1
-
-    index = 0
-    for i in range(key):
-        for j in range(len(cipher)):
-            if rail[i][j] == '*' and index < len(cipher):
-                rail[i][j] = cipher[index]
-                index += 1
-
-    result = []
-    row, col = 0, 0
-    for _ in range(len(cipher)):
-        if row == 0:
-            dir_down = True
-        if row == key - 1:
-            dir_down = False
-        if rail[row][col] != '*':
-            result.append(rail[row][col])
-            col += 1
-        row += 1 if dir_down else -1
-    return "".join(result)
+    return "".join(iter_decrypt_rail_fence(cipher, key, max(len(cipher), 1)))
 
 # ---------- VIGENERE CIPHER ----------
-def vigenere_encrypt(plain_text, key):
+# Huruf dikumpulkan jadi satu string lalu digeser per posisi kunci dengan
+# str.translate pada slice berlangkah len(key), jadi tidak ada loop per karakter.
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_NON_UPPER_RUN = re.compile("([^A-Z]+)")
+_DELETE_NON_UPPER = {c: None for c in range(128) if chr(c) not in _UPPER}
+
+@lru_cache(maxsize=52)
+def _shift_table(shift):
+    shift %= 26
+    return str.maketrans(_UPPER, _UPPER[shift:] + _UPPER[:shift])
+
+@lru_cache(maxsize=256)
+def _vigenere_tables(key, sign):
     key = key.upper()
-    plain_text = plain_text.upper()
-    cipher_text = ""
+    return tuple(_shift_table(sign * (ord(k) - ord('A'))) for k in key)
+
+def _vigenere_loop(text, key, sign):
+    # jalur lambat untuk teks non-ASCII, semantik sama persis dengan versi lama
+    key = key.upper()
+    result = []
     key_index = 0
-    for char in plain_text:
+    for char in text:
         if char.isalpha():
-            shift = ord(key[key_index % len(key)]) - ord('A')
-            cipher_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+            shift = sign * (ord(key[key_index % len(key)]) - ord('A'))
+            result.append(chr((ord(char) - ord('A') + shift) % 26 + ord('A')))
             key_index += 1
         else:
-            cipher_text += char
-    return cipher_text
+            result.append(char)
+    return "".join(result)
+
+def _vigenere(text, key, sign):
+    text = text.upper()
+    if not text.isascii():
+        return _vigenere_loop(text, key, sign)
+
+    pieces = _NON_UPPER_RUN.split(text)
+    letters = "".join(pieces[0::2])
+    if not letters:
+        return text
+    tables = _vigenere_tables(key, sign)
+    if not tables:
+        raise ValueError("Kunci tidak boleh kosong")
+
+    shifted = [None] * len(letters)
+    for i, table in enumerate(tables):
+        shifted[i::len(tables)] = letters[i::len(tables)].translate(table)
+    shifted = "".join(shifted)
+
+    # kembalikan huruf yang sudah digeser ke posisi aslinya
+    pos = 0
+    for i in range(0, len(pieces), 2):
+        size = len(pieces[i])
+        pieces[i] = shifted[pos:pos + size]
+        pos += size
+    return "".join(pieces)
+
+@instrument_cipher("vigenere", "encrypt")
+def vigenere_encrypt(plain_text, key):
+    return _vigenere(plain_text, key, 1)
 
+@instrument_cipher("vigenere", "decrypt")
 def vigenere_decrypt(cipher_text, key):
-    key = key.upper()
-    cipher_text = cipher_text.upper()
-    plain_text = ""
-    key_index = 0
-    for char in cipher_text:
-        if char.isalpha():
-            shift = ord(key[key_index % len(key)]) - ord('A')
-            plain_text += chr((ord(char) - ord('A') - shift + 26) % 26 + ord('A'))
-            key_index += 1
+    return _vigenere(cipher_text, key, -1)
+
+def _vigenere_batch(pairs, sign):
+    # Record dengan kunci yang sama digabung jadi satu string dipisah "\0",
+    # tiap record diberi padding "A" sampai jumlah hurufnya kelipatan panjang
+    # kunci, sehingga indeks kunci tiap record tetap mulai dari nol.
+    results = [None] * len(pairs)
+    groups = {}
+    for i, (text, key) in enumerate(pairs):
+        text = text.upper()
+        if key and text.isascii() and "\0" not in text:
+            groups.setdefault(key, []).append((i, text))
         else:
-            plain_text += char
-    return plain_text
+            results[i] = _vigenere(text, key, sign)
+
+    for key, items in groups.items():
+        key_len = len(_vigenere_tables(key, sign))
+        pads = [-len(text.translate(_DELETE_NON_UPPER)) % key_len for _, text in items]
+        joined = "\0".join(text + "A" * pad for (_, text), pad in zip(items, pads))
+        parts = _vigenere(joined, key, sign).split("\0")
+        for (i, _), pad, part in zip(items, pads, parts):
+            results[i] = part[:len(part) - pad]
+    return results
+
+@instrument_cipher("vigenere", "encrypt_batch", _batch_size)
+def vigenere_encrypt_batch(pairs):
+    """Mengenkripsi banyak pasangan (teks, kunci) sekaligus."""
+    return _vigenere_batch(pairs, 1)
+
+@instrument_cipher("vigenere", "decrypt_batch", _batch_size)
+def vigenere_decrypt_batch(pairs):
+    """Mendekripsi banyak pasangan (cipher, kunci) sekaligus."""
+    return _vigenere_batch(pairs, -1)
 
 # ---------- AES CIPHER ----------
+AES_CACHE_MAX_ENTRIES = 128
+AES_CACHE_MAX_BYTES = 256 * 1024
+AES_FILE_CHUNK = 64 * 1024  # harus kelipatan AES.block_size
+
+class AESContextCache:
+    """Cache LRU berbatas untuk objek cipher AES per password.
+
+    Menghindari sha256 + AES.new berulang untuk password yang sama.
+    Entri terlama dibuang jika jumlah entri atau perkiraan memorinya
+    melewati batas.
+    """
+    # perkiraan memori per entri selain password: kunci turunan, round key, objek
+    ENTRY_OVERHEAD = 512
+
+    def __init__(self, max_entries=AES_CACHE_MAX_ENTRIES, max_bytes=AES_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _entry_size(self, key_str):
+        return len(key_str.encode()) + self.ENTRY_OVERHEAD
+
+    def get(self, key_str):
+        with self._lock:
+            cipher = self._entries.get(key_str)
+            if cipher is not None:
+                self._entries.move_to_end(key_str)
+                return cipher
+
+        key = hashlib.sha256(key_str.encode()).digest()
+        cipher = AES.new(key, AES.MODE_ECB)
+        with self._lock:
+            if key_str not in self._entries:
+                self._entries[key_str] = cipher
+                self._bytes += self._entry_size(key_str)
+                while self._entries and (len(self._entries) > self.max_entries
+                                         or self._bytes > self.max_bytes):
+                    old_key, _ = self._entries.popitem(last=False)
+                    self._bytes -= self._entry_size(old_key)
+        return cipher
+
+    def evict(self, key_str):
+        with self._lock:
+            if self._entries.pop(key_str, None) is not None:
+                self._bytes -= self._entry_size(key_str)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+aes_cache = AESContextCache()
+
+@instrument_cipher("aes", "encrypt")
 def encrypt_aes(plaintext, key_str):
     """Mengenkripsi plaintext menggunakan AES."""
-    key = hashlib.sha256(key_str.encode()).digest()
-    cipher = AES.new(key, AES.MODE_ECB)
+    cipher = aes_cache.get(key_str)
     padded_data = pad(plaintext.encode(), AES.block_size)
     ciphertext = cipher.encrypt(padded_data)
     return base64.b64encode(ciphertext).decode('utf-8')
 
+@instrument_cipher("aes", "decrypt")
 def decrypt_aes(ciphertext_b64, key_str):
     """Mendekripsi ciphertext menggunakan AES."""
     try:
-        key = hashlib.sha256(key_str.encode()).digest()
-        cipher = AES.new(key, AES.MODE_ECB)
+        cipher = aes_cache.get(key_str)
         ciphertext = base64.b64decode(ciphertext_b64)
         padded_data = cipher.decrypt(ciphertext)
         return unpad(padded_data, AES.block_size).decode('utf-8')
     except (ValueError, KeyError) as e:
         return f"Error Dekripsi: {e}"
 
+def encrypt_aes_many(records, key_str):
+    """Mengenkripsi banyak plaintext dengan satu konteks AES (generator)."""
+    cipher = aes_cache.get(key_str)
+    for plaintext in records:
+        yield base64.b64encode(cipher.encrypt(pad(plaintext.encode(), AES.block_size))).decode('utf-8')
+
+def decrypt_aes_many(records, key_str):
+    """Mendekripsi banyak ciphertext base64 dengan satu konteks AES (generator)."""
+    cipher = aes_cache.get(key_str)
+    for ciphertext_b64 in records:
+        try:
+            padded_data = cipher.decrypt(base64.b64decode(ciphertext_b64))
+            yield unpad(padded_data, AES.block_size).decode('utf-8')
+        except (ValueError, KeyError) as e:
+            yield f"Error Dekripsi: {e}"
+
+def _read_full(src, size):
+    # read() pada pipe/socket bisa mengembalikan kurang dari size byte
+    parts = []
+    while size > 0:
+        part = src.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b"".join(parts)
+
+def encrypt_aes_file(src, dst, key_str, chunk_size=AES_FILE_CHUNK):
+    """Mengenkripsi file biner src ke dst per potongan chunk_size byte."""
+    cipher = aes_cache.get(key_str)
+    chunk = _read_full(src, chunk_size)
+    while True:
+        next_chunk = _read_full(src, chunk_size)
+        if not next_chunk:
+            # potongan terakhir diberi padding PKCS#7
+            dst.write(cipher.encrypt(pad(chunk, AES.block_size)))
+            return
+        dst.write(cipher.encrypt(chunk))
+        chunk = next_chunk
+
+def decrypt_aes_file(src, dst, key_str, chunk_size=AES_FILE_CHUNK):
+    """Mendekripsi file biner hasil encrypt_aes_file per potongan chunk_size byte."""
+    cipher = aes_cache.get(key_str)
+    chunk = _read_full(src, chunk_size)
+    if not chunk:
+        raise ValueError("Ciphertext kosong")
+    while True:
+        next_chunk = _read_full(src, chunk_size)
+        if not next_chunk:
+            dst.write(unpad(cipher.decrypt(chunk), AES.block_size))
+            return
+        dst.write(cipher.decrypt(chunk))
+        chunk = next_chunk
+
 # ---------- RSA IMPLEMENTATION ----------
 def gcd(a, b):
     while b != 0:
@@ -166,13 +964,447 @@ def generate_keypair(p, q):
     d = multiplicative_inverse(e, phi)
     return ((e, n), (d, n))
 
+# bilangan prima kecil untuk menyaring kandidat sebelum Miller-Rabin
+_SMALL_PRIMES = [p for p in range(3, 2000, 2) if all(p % q for q in range(3, int(p ** 0.5) + 1, 2))]
+
+def is_probable_prime(n, rounds=40):
+    """Uji primalitas Miller-Rabin."""
+    if n < 2:
+        return False
+    if n in (2, 3):
+        return True
+    if n % 2 == 0:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    r, s = 0, n - 1
+    while s % 2 == 0:
+        r += 1
+        s //= 2
+    for _ in range(rounds):
+        a = secrets.randbelow(n - 3) + 2
+        x = pow(a, s, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def generate_prime(bits):
+    while True:
+        # dua bit teratas diset agar p * q tepat 2 * bits bit
+        candidate = secrets.randbits(bits) | (0b11 << (bits - 2)) | 1
+        if is_probable_prime(candidate):
+            return candidate
+
+RSAKey = namedtuple("RSAKey", "n e d p q dp dq qinv")
+
+def rsa_key_from_primes(p, q, e=65537):
+    d = pow(e, -1, (p - 1) * (q - 1))
+    return RSAKey(p * q, e, d, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+
+def generate_rsa_key(bits=2048, e=65537):
+    """Membuat kunci RSA dengan parameter CRT (dp, dq, qinv)."""
+    while True:
+        p = generate_prime(bits // 2)
+        q = generate_prime(bits - bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and gcd(e, phi) == 1:
+            return rsa_key_from_primes(p, q, e)
+
+app.config["RSA_KEY_FILE"] = os.environ.get("RSA_KEY_FILE", "rsa_key.json")
+app.config["RSA_KEY_BITS"] = int(os.environ.get("RSA_KEY_BITS", 2048))
+_rsa_key = None
+_rsa_key_lock = threading.Lock()
+
+def get_rsa_key():
+    """Mengambil kunci RSA aplikasi; dibuat sekali lalu disimpan ke RSA_KEY_FILE."""
+    global _rsa_key
+    if _rsa_key is not None:
+        return _rsa_key
+    with _rsa_key_lock:
+        if _rsa_key is not None:
+            return _rsa_key
+        path = app.config["RSA_KEY_FILE"]
+        if not os.path.exists(path):
+            key = generate_rsa_key(app.config["RSA_KEY_BITS"])
+            # tulis ke file sementara lalu link, supaya worker lain tidak
+            # membaca file setengah jadi; kunci privat hanya untuk pemilik
+            tmp = f"{path}.{os.getpid()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"p": key.p, "q": key.q, "e": key.e}, f)
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass  # worker lain lebih dulu, pakai kuncinya
+            finally:
+                os.unlink(tmp)
+        with open(path) as f:
+            data = json.load(f)
+        key = rsa_key_from_primes(data["p"], data["q"], data["e"])
+        _rsa_key = key
+    return _rsa_key
+
+def _rsa_block_size(n):
+    # satu byte penanda 0x01 + blok harus tetap lebih kecil dari n
+    return (n.bit_length() - 1) // 8 - 1
+
+def _rsa_decrypt_int(private_key, c):
+    if isinstance(private_key, RSAKey):
+        # CRT: dua pow dengan modulus setengah ukuran, kira-kira 3-4x lebih cepat
+        k = private_key
+        m1 = pow(c, k.dp, k.p)
+        m2 = pow(c, k.dq, k.q)
+        h = (k.qinv * (m1 - m2)) % k.p
+        return m2 + h * k.q
+    d, n = private_key
+    return pow(c, d, n)
+
+@instrument_cipher("rsa", "encrypt", lambda args, result: len(args[1]))
 def encrypt(public_key, plaintext):
-    e, n = public_key
-    return [pow(ord(char), e, n) for char in plaintext]
+    """Mengenkripsi teks; byte UTF-8 dipaket per blok, satu pow per blok.
 
+    Untuk modulus kecil (misal generate_keypair(17, 19)) tetap satu pow
+    per karakter seperti sebelumnya.
+    """
+    e, n = public_key
+    size = _rsa_block_size(n)
+    if size < 1:
+        return [pow(ord(char), e, n) for char in plaintext]
+    data = plaintext.encode()
+    return [pow(int.from_bytes(b"\x01" + data[i:i + size], "big"), e, n)
+            for i in range(0, len(data), size)]
+
+@instrument_cipher("rsa", "decrypt")
 def decrypt(private_key, ciphertext):
-    d, n = private_key
-    return "".join([chr(pow(char, d, n)) for char in ciphertext])
+    """Mendekripsi list blok hasil encrypt; private_key berupa (d, n) atau RSAKey."""
+    n = private_key.n if isinstance(private_key, RSAKey) else private_key[1]
+    if _rsa_block_size(n) < 1:
+        return "".join([chr(_rsa_decrypt_int(private_key, char)) for char in ciphertext])
+    blocks = []
+    for c in ciphertext:
+        m = _rsa_decrypt_int(private_key, c)
+        # buang byte penanda 0x01 di depan
+        blocks.append(m.to_bytes((m.bit_length() + 7) // 8, "big")[1:])
+    return b"".join(blocks).decode()
+
+# ---------- CIPHERTEXT STORAGE ----------
+# Ciphertext disimpan sebagai BLOB dengan envelope biner berversi:
+#   header ">BBH": versi, id cipher, panjang parameter
+#   parameter   : zigzag -> jumlah rail (">H"), rsa -> lebar blok byte (">H")
+#   payload     : teks UTF-8 (zigzag/vigenere/text), byte mentah (aes),
+#                 integer big-endian lebar tetap (rsa)
+ENVELOPE_VERSION = 1
+CIPHER_IDS = {"text": 0, "zigzag": 1, "vigenere": 2, "aes": 3, "rsa": 4}
+_CIPHER_NAMES = {v: k for k, v in CIPHER_IDS.items()}
+_ENVELOPE_HEADER = struct.Struct(">BBH")
+_U16 = struct.Struct(">H")
+_RSA_LIST = re.compile(r"\[\s*\d+(\s*,\s*\d+)*\s*\]")
+
+def pack_envelope(cipher, payload, params=b""):
+    return _ENVELOPE_HEADER.pack(ENVELOPE_VERSION, CIPHER_IDS[cipher], len(params)) + params + payload
+
+def unpack_envelope(blob):
+    """Mengurai envelope menjadi (cipher, params, payload)."""
+    version, cipher_id, params_len = _ENVELOPE_HEADER.unpack_from(blob)
+    if version != ENVELOPE_VERSION or cipher_id not in _CIPHER_NAMES:
+        raise ValueError("Envelope ciphertext tidak dikenal")
+    start = _ENVELOPE_HEADER.size
+    return _CIPHER_NAMES[cipher_id], blob[start:start + params_len], blob[start + params_len:]
+
+def encode_ciphertext(cipher, value, rail=None):
+    """Membungkus hasil cipher (string, base64 AES, atau list blok RSA) ke envelope."""
+    if cipher == "zigzag":
+        return pack_envelope(cipher, value.encode(), _U16.pack(rail))
+    if cipher == "aes":
+        return pack_envelope(cipher, base64.b64decode(value))
+    if cipher == "rsa":
+        width = max([(c.bit_length() + 7) // 8 for c in value] + [1])
+        return pack_envelope(cipher, b"".join(c.to_bytes(width, "big") for c in value), _U16.pack(width))
+    return pack_envelope(cipher, value.encode())
+
+def decode_rsa_payload(params, payload):
+    width = _U16.unpack(params)[0]
+    return [int.from_bytes(payload[i:i + width], "big") for i in range(0, len(payload), width)]
+
+@app.template_filter("ciphertext")
+def decode_ciphertext(value):
+    """Bentuk teks ciphertext untuk ditampilkan/diexport (sama dengan format lama)."""
+    if not isinstance(value, bytes):
+        return value  # baris lama yang belum dimigrasi
+    cipher, params, payload = unpack_envelope(value)
+    if cipher == "aes":
+        return base64.b64encode(payload).decode('utf-8')
+    if cipher == "rsa":
+        return str(decode_rsa_payload(params, payload))
+    return payload.decode()
+
+def parse_rsa_blocks(text):
+    """Mengurai input "[123, 456]" menjadi list int tanpa eval."""
+    text = text.strip()
+    if not _RSA_LIST.fullmatch(text):
+        raise ValueError("Cipher RSA harus berupa list angka, misalnya [123, 456]")
+    return [int(part) for part in text[1:-1].split(",")]
+
+def legacy_to_envelope(value):
+    """Menebak cipher baris lama (teks) lalu mengubahnya ke envelope.
+
+    Hanya bentuk yang tidak ambigu yang diubah: list angka persis seperti
+    str(list) -> rsa, base64 kanonik kelipatan blok AES yang memuat '+', '/'
+    atau '=' -> aes. Selain itu (termasuk teks alfanumerik yang kebetulan
+    base64 valid, misalnya hasil zigzag) disimpan sebagai teks. Dalam semua
+    kasus decode_ciphertext mengembalikan teks aslinya.
+    """
+    if _RSA_LIST.fullmatch(value):
+        blocks = parse_rsa_blocks(value)
+        if str(blocks) == value:
+            return encode_ciphertext("rsa", blocks)
+    if len(value) >= 24 and len(value) % 4 == 0 and any(c in "+/=" for c in value):
+        try:
+            raw = base64.b64decode(value, validate=True)
+        except ValueError:
+            raw = b""
+        if raw and len(raw) % AES.block_size == 0 and base64.b64encode(raw).decode() == value:
+            return pack_envelope("aes", raw)
+    return encode_ciphertext("text", value)
+
+def migrate_ciphertexts(conn, batch_size=1000):
+    """Mengubah ciphertext teks lama ke envelope biner; mengembalikan jumlah baris."""
+    total, after = 0, 0
+    while True:
+        rows = conn.execute("SELECT id, password FROM mahasiswa WHERE id > ? AND typeof(password) = 'text' "
+                            "ORDER BY id LIMIT ?", (after, batch_size)).fetchall()
+        if not rows:
+            return total
+        with conn:
+            conn.executemany("UPDATE mahasiswa SET password = ? WHERE id = ?",
+                             [(legacy_to_envelope(password), id_) for id_, password in rows])
+            bump_table_version(conn)
+        total += len(rows)
+        after = rows[-1][0]
+
+# ---------- BULK IMPORT / EXPORT ----------
+CIPHERS = ("zigzag", "vigenere", "aes", "rsa")
+IMPORT_BATCH = 1000
+EXPORT_COLUMNS = ("id", "nama", "nim", "jk", "password")
+
+def check_cipher_params(cipher, key=None):
+    if cipher not in CIPHERS:
+        raise ValueError(f"Cipher tidak dikenal: {cipher}")
+    if cipher in ("vigenere", "aes") and not (isinstance(key, str) and key):
+        raise ValueError(f"Cipher {cipher} membutuhkan key berupa teks")
+
+def encrypt_batch(cipher, rows, rail=3, key=None):
+    """Mengenkripsi satu batch baris (nama, nim, jk, password) sekaligus.
+
+    Yang dienkripsi sama dengan form di halaman cipher masing-masing:
+    password untuk zigzag/vigenere/rsa, identitas mahasiswa untuk AES.
+    """
+    check_cipher_params(cipher, key)
+    if cipher == "zigzag":
+        return [encrypt_rail_fence(row[3], rail) for row in rows]
+    if cipher == "vigenere":
+        return vigenere_encrypt_batch([(row[3], key) for row in rows])
+    if cipher == "aes":
+        return list(encrypt_aes_many((f"Nama: {nama}, NIM: {nim}, JK: {jk}"
+                                      for nama, nim, jk, _ in rows), key))
+    rsa_key = get_rsa_key()
+    return [encrypt((rsa_key.e, rsa_key.n), row[3]) for row in rows]
+
+IMPORT_FIELDS = ("nama", "nim", "jk", "password")
+
+class PartialImportError(ValueError):
+    """Import gagal di tengah jalan; batch sebelum error sudah tersimpan."""
+
+    def __init__(self, message, imported):
+        super().__init__(message)
+        self.imported = imported
+
+def _import_row(row, line_no):
+    if not isinstance(row, dict):
+        raise ValueError(f"Baris {line_no}: harus berupa objek")
+    if not any(field in row for field in IMPORT_FIELDS):
+        raise ValueError(f"Baris {line_no}: tidak ada kolom {', '.join(IMPORT_FIELDS)}")
+    values = []
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if value is None:
+            value = ""
+        elif isinstance(value, (dict, list)):
+            raise ValueError(f"Baris {line_no}: kolom {field} harus berupa teks")
+        values.append(str(value))
+    return tuple(values)
+
+def iter_import_rows(stream, fmt):
+    """Membaca baris (nama, nim, jk, password) dari stream teks CSV/JSONL satu per satu.
+
+    CSV wajib punya baris header dengan semua kolom IMPORT_FIELDS. Nilai
+    angka/boolean diubah ke teks, null dan kolom kosong menjadi "".
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        try:
+            if reader.fieldnames is None:
+                return
+            missing = [field for field in IMPORT_FIELDS if field not in reader.fieldnames]
+            if missing:
+                raise ValueError(f"Header CSV harus memuat kolom {', '.join(IMPORT_FIELDS)} "
+                                 f"(tidak ada: {', '.join(missing)})")
+            for row in reader:
+                yield _import_row(row, reader.line_num)
+        except csv.Error as e:
+            raise ValueError(f"CSV tidak valid di baris {reader.line_num}: {e}") from e
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Baris {line_no}: JSON tidak valid: {e}") from e
+                yield _import_row(row, line_no)
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+
+def import_format(filename, fmt=None):
+    if fmt:
+        return fmt
+    return "jsonl" if filename and filename.endswith((".jsonl", ".ndjson")) else "csv"
+
+def import_mahasiswa(rows, cipher, rail=3, key=None, batch_size=IMPORT_BATCH):
+    """Mengenkripsi dan menyimpan baris per batch; satu transaksi per batch.
+
+    Import tidak atomik: jika ada baris yang tidak valid, batch sebelumnya
+    tetap tersimpan dan jumlahnya dilaporkan lewat PartialImportError.imported.
+    """
+    check_cipher_params(cipher, key)
+    rows = iter(rows)
+    conn = get_db()
+    total = 0
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return total
+            ciphertexts = encrypt_batch(cipher, batch, rail, key)
+            with timed("insert"), conn:
+                conn.executemany(INSERT_MAHASISWA, [(nama, nim, jk, encode_ciphertext(cipher, ciphertext, rail))
+                                                    for (nama, nim, jk, _), ciphertext in zip(batch, ciphertexts)])
+                bump_table_version(conn)
+            total += len(batch)
+    except (ValueError, TypeError) as e:
+        raise PartialImportError(str(e), total) from e
+
+def iter_export(fmt, batch_size=IMPORT_BATCH):
+    """Menghasilkan isi tabel mahasiswa sebagai CSV/JSONL per halaman."""
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+    if fmt == "csv":
+        yield ",".join(EXPORT_COLUMNS) + "\r\n"
+    after = None
+    while True:
+        rows, after = list_mahasiswa(after=after, limit=batch_size)
+        rows = [row[:4] + (decode_ciphertext(row[4]),) for row in rows]
+        buf = io.StringIO()
+        if fmt == "csv":
+            csv.writer(buf).writerows(rows)
+        else:
+            for row in rows:
+                buf.write(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n")
+        yield buf.getvalue()
+        if after is None:
+            return
+
+# ---------- JSON API ----------
+app.config["API_WORKERS"] = int(os.environ.get("API_WORKERS", os.cpu_count() or 1))
+app.config["API_INLINE_MAX"] = int(os.environ.get("API_INLINE_MAX", 256))
+app.config["API_MAX_PENDING"] = int(os.environ.get("API_MAX_PENDING", 8))
+app.config["API_MAX_INPUTS"] = int(os.environ.get("API_MAX_INPUTS", 10000))
+app.config["API_MAX_RAIL"] = int(os.environ.get("API_MAX_RAIL", 1000))
+
+_api_pool = None
+_api_slots = None
+_api_pool_lock = threading.Lock()
+
+def run_cipher(cipher, mode, inputs, rail=3, key=None, rsa_key=None):
+    """Menjalankan satu cipher untuk list input; urutan hasil sama dengan input."""
+    encrypting = mode == "encrypt"
+    if cipher == "zigzag":
+        func = encrypt_rail_fence if encrypting else decrypt_rail_fence
+        return [func(text, rail) for text in inputs]
+    if cipher == "vigenere":
+        func = vigenere_encrypt_batch if encrypting else vigenere_decrypt_batch
+        return func([(text, key) for text in inputs])
+    if cipher == "aes":
+        func = encrypt_aes_many if encrypting else decrypt_aes_many
+        return list(func(inputs, key))
+    if encrypting:
+        return [encrypt((rsa_key.e, rsa_key.n), text) for text in inputs]
+    return [decrypt(rsa_key, blocks) for blocks in inputs]
+
+def _get_api_pool():
+    global _api_pool, _api_slots
+    with _api_pool_lock:
+        if _api_pool is None:
+            # jangan fork dari server yang multi-thread: lock (metrics, cache, logging)
+            # yang sedang dipegang thread lain ikut tersalin dan bisa deadlock di worker
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _api_pool = ProcessPoolExecutor(max_workers=app.config["API_WORKERS"],
+                                            mp_context=multiprocessing.get_context(method))
+            _api_slots = threading.BoundedSemaphore(app.config["API_MAX_PENDING"])
+            atexit.register(_api_pool.shutdown)
+    return _api_pool, _api_slots
+
+def run_cipher_parallel(cipher, mode, inputs, rail=3, key=None, rsa_key=None):
+    """Seperti run_cipher, tetapi batch besar dibagi ke process pool.
+
+    Mengembalikan None jika antrean pool sudah penuh.
+    """
+    if len(inputs) <= app.config["API_INLINE_MAX"]:
+        return run_cipher(cipher, mode, inputs, rail, key, rsa_key)
+
+    pool, slots = _get_api_pool()
+    if not slots.acquire(blocking=False):
+        return None
+    futures = []
+    try:
+        workers = app.config["API_WORKERS"]
+        size = max(-(-len(inputs) // workers), app.config["API_INLINE_MAX"] // 4, 1)
+        futures = [pool.submit(run_cipher, cipher, mode, inputs[i:i + size], rail, key, rsa_key)
+                   for i in range(0, len(inputs), size)]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    finally:
+        # slot baru dilepas setelah tidak ada potongan request ini yang masih
+        # antre atau berjalan di pool, termasuk saat salah satunya gagal
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        slots.release()
+
+def _check_api_inputs(cipher, mode, inputs, rail):
+    if mode not in ("encrypt", "decrypt"):
+        raise ValueError("mode harus encrypt atau decrypt")
+    if not isinstance(inputs, list):
+        raise ValueError("inputs harus berupa array")
+    if len(inputs) > app.config["API_MAX_INPUTS"]:
+        raise ValueError(f"inputs maksimal {app.config['API_MAX_INPUTS']} elemen")
+    if cipher == "zigzag" and not 1 <= rail <= app.config["API_MAX_RAIL"]:
+        raise ValueError(f"rail harus antara 1 dan {app.config['API_MAX_RAIL']}")
+    if cipher == "rsa" and mode == "decrypt":
+        for blocks in inputs:
+            if not isinstance(blocks, list) or not all(type(c) is int for c in blocks):
+                raise ValueError("input dekripsi RSA harus berupa array bilangan bulat")
+    elif not all(isinstance(text, str) for text in inputs):
+        raise ValueError("inputs harus berupa array string")
 
 # ---------- ROUTES ----------
 @app.route("/")
@@ -197,12 +1429,7 @@ def zigzag():
                 cipher = encrypt_rail_fence(password, rail)
 
                 # Simpan ke DB
-                conn = sqlite3.connect("mahasiswa.db")
-                c = conn.cursor()
-                c.execute("INSERT INTO mahasiswa (nama, nim, jk, password) VALUES (?, ?, ?, ?)",
-                          (nama, nim, jk, cipher))
-                conn.commit()
-                conn.close()
+                insert_mahasiswa(nama, nim, jk, encode_ciphertext("zigzag", cipher, rail))
 
                 result = cipher
 
@@ -212,14 +1439,7 @@ def zigzag():
         except Exception as e:
             error = str(e)
 
-    # Ambil semua data mahasiswa
-    conn = sqlite3.connect("mahasiswa.db")
-    c = conn.cursor()
-    c.execute("SELECT * FROM mahasiswa")
-    mahasiswa_list = c.fetchall()
-    conn.close()
-
-    return render_template("zigzag.html", result=result, error=error, mahasiswa=mahasiswa_list)
+    return render_with_mahasiswa("zigzag.html", result=result, error=error)
 
 @app.route("/vigenere", methods=["GET", "POST"])
 def vigenere():
@@ -238,12 +1458,7 @@ def vigenere():
 
                 cipher = vigenere_encrypt(password, key)
 
-                conn = sqlite3.connect("mahasiswa.db")
-                c = conn.cursor()
-                c.execute("INSERT INTO mahasiswa (nama, nim, jk, password) VALUES (?, ?, ?, ?)",
-                          (nama, nim, jk, cipher))
-                conn.commit()
-                conn.close()
+                insert_mahasiswa(nama, nim, jk, encode_ciphertext("vigenere", cipher))
 
                 result = cipher
 
@@ -253,13 +1468,7 @@ def vigenere():
         except Exception as e:
             error = str(e)
 
-    conn = sqlite3.connect("mahasiswa.db")
-    c = conn.cursor()
-    c.execute("SELECT * FROM mahasiswa")
-    mahasiswa_list = c.fetchall()
-    conn.close()
-
-    return render_template("vigenere.html", result=result, error=error, mahasiswa=mahasiswa_list)
+    return render_with_mahasiswa("vigenere.html", result=result, error=error)
 
 @app.route("/aes", methods=["GET", "POST"])
 def aes():
@@ -279,12 +1488,7 @@ def aes():
                 data_to_encrypt = f"Nama: {nama}, NIM: {nim}, JK: {jk}"
                 cipher = encrypt_aes(data_to_encrypt, password)
 
-                conn = sqlite3.connect("mahasiswa.db")
-                c = conn.cursor()
-                c.execute("INSERT INTO mahasiswa (nama, nim, jk, password) VALUES (?, ?, ?, ?)",
-                          (nama, nim, jk, cipher))
-                conn.commit()
-                conn.close()
+                insert_mahasiswa(nama, nim, jk, encode_ciphertext("aes", cipher))
                 
                 result = f"Ciphertext: {cipher}"
             
@@ -298,20 +1502,15 @@ def aes():
         except Exception as e:
             error = f"Error: {e}. Pastikan password dan ciphertext benar."
 
-    conn = sqlite3.connect("mahasiswa.db")
-    c = conn.cursor()
-    c.execute("SELECT * FROM mahasiswa")
-    mahasiswa_list = c.fetchall()
-    conn.close()
-
-    return render_template("aes.html", result=result, error=error, mahasiswa=mahasiswa_list)
+    return render_with_mahasiswa("aes.html", result=result, error=error)
 
 @app.route("/rsa", methods=["GET", "POST"])
 def rsa():
     result, error = None, None
 
-    # generate key setiap kali load (untuk demo)
-    public, private = generate_keypair(17, 19)  # contoh bilangan prima kecil
+    # kunci dibuat sekali dan dipakai ulang, jadi hasil enkripsi bisa didekripsi
+    private = get_rsa_key()
+    public = (private.e, private.n)
 
     if request.method == "POST":
         mode = request.form["mode"]
@@ -325,32 +1524,131 @@ def rsa():
 
                 cipher = encrypt(public, password)
 
-                # Simpan ke DB (cipher jadi string biar gampang)
-                conn = sqlite3.connect("mahasiswa.db")
-                c = conn.cursor()
-                c.execute("INSERT INTO mahasiswa (nama, nim, jk, password) VALUES (?, ?, ?, ?)",
-                          (nama, nim, jk, str(cipher)))
-                conn.commit()
-                conn.close()
+                # Simpan ke DB sebagai envelope biner (integer lebar tetap)
+                insert_mahasiswa(nama, nim, jk, encode_ciphertext("rsa", cipher))
 
                 result = cipher
 
             elif mode == "decrypt":
                 # input password = cipher list string (contoh: [123,456,...])
-                cipher_list = eval(password)
+                cipher_list = parse_rsa_blocks(password)
                 result = decrypt(private, cipher_list)
 
         except Exception as e:
             error = str(e)
 
-    # Ambil semua data mahasiswa
-    conn = sqlite3.connect("mahasiswa.db")
-    c = conn.cursor()
-    c.execute("SELECT * FROM mahasiswa")
-    mahasiswa_list = c.fetchall()
-    conn.close()
+    return render_with_mahasiswa("rsa.html", result=result, error=error)
+
 
-    return render_template("rsa.html", result=result, error=error, mahasiswa=mahasiswa_list)
+@app.route("/import", methods=["POST"])
+def import_data():
+    # body mentah (CSV/JSONL) dibaca dari request.stream, jadi parameternya harus
+    # lewat query string; hanya upload multipart yang boleh membawa field form
+    if request.mimetype == "application/x-www-form-urlencoded":
+        return jsonify({"error": "Kirim file sebagai multipart/form-data atau body mentah dengan "
+                                 "Content-Type text/csv / application/x-ndjson", "imported": 0}), 400
+    multipart = request.mimetype == "multipart/form-data"
+    params = request.values if multipart else request.args
+    cipher = params.get("cipher", "")
+    key = params.get("key")
+    try:
+        rail = int(params.get("rail", 3))
+        check_cipher_params(cipher, key)
+        if multipart:
+            upload = request.files.get("file")
+            if upload is None:
+                raise ValueError("Field file tidak ada")
+            fmt = import_format(upload.filename, params.get("format"))
+            raw = upload.stream
+        else:
+            fmt = import_format(None, params.get("format"))
+            raw = request.stream
+        stream = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        total = import_mahasiswa(iter_import_rows(stream, fmt), cipher, rail, key)
+    except PartialImportError as e:
+        return jsonify({"error": str(e), "imported": e.imported}), 400
+    except (ValueError, TypeError, KeyError) as e:
+        return jsonify({"error": str(e), "imported": 0}), 400
+    return jsonify({"imported": total})
+
+@app.route("/export")
+def export_data():
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": f"Format tidak dikenal: {fmt}"}), 400
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(iter_export(fmt)), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=mahasiswa.{fmt}"})
+
+@app.route("/api/v1/<cipher>", methods=["POST"])
+def api_cipher(cipher):
+    if cipher not in CIPHERS:
+        return jsonify({"error": f"Cipher tidak dikenal: {cipher}"}), 404
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Body harus berupa objek JSON"}), 400
+    mode = payload.get("mode", "encrypt")
+    inputs = payload.get("inputs")
+    key = payload.get("key")
+    try:
+        rail = int(payload.get("rail", 3))
+        _check_api_inputs(cipher, mode, inputs, rail)
+        if cipher in ("vigenere", "aes"):
+            check_cipher_params(cipher, key)
+        rsa_key = get_rsa_key() if cipher == "rsa" else None
+        with timed("batch"):
+            results = run_cipher_parallel(cipher, mode, inputs, rail, key, rsa_key)
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    if results is None:
+        return jsonify({"error": "Server sedang sibuk, coba lagi"}), 503, {"Retry-After": "1"}
+    return jsonify({"cipher": cipher, "mode": mode, "results": results})
+
+@app.route("/metrics")
+def metrics_endpoint():
+    if not app.config["METRICS"]:
+        return "Metrics tidak aktif (set METRICS_ENABLED=1)", 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+# ---------- CLI ----------
+@app.cli.command("import-mahasiswa")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--cipher", type=click.Choice(CIPHERS), required=True)
+@click.option("--rail", type=int, default=3, help="jumlah rail untuk zigzag")
+@click.option("--key", help="kunci untuk vigenere/aes")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]))
+@click.option("--batch-size", type=int, default=IMPORT_BATCH)
+def import_mahasiswa_command(path, cipher, rail, key, fmt, batch_size):
+    """Import data mahasiswa dari file CSV/JSONL."""
+    init_db()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = iter_import_rows(f, import_format(path, fmt))
+        try:
+            total = import_mahasiswa(rows, cipher, rail, key, batch_size)
+        except PartialImportError as e:
+            raise click.ClickException(f"{e} ({e.imported} baris sudah diimport)") from e
+    click.echo(f"{total} baris diimport")
+
+@app.cli.command("migrate-ciphertext")
+@click.option("--vacuum/--no-vacuum", default=True, help="VACUUM setelah migrasi agar file DB mengecil")
+def migrate_ciphertext_command(vacuum):
+    """Mengubah ciphertext teks lama (str(list), base64) ke envelope biner."""
+    init_db()
+    conn = get_db()
+    total = migrate_ciphertexts(conn)
+    if vacuum:
+        conn.execute("VACUUM")
+    click.echo(f"{total} baris dimigrasi")
+
+@app.cli.command("export-mahasiswa")
+@click.argument("output", type=click.File("w"), default="-")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default="csv")
+def export_mahasiswa_command(output, fmt):
+    """Export data mahasiswa ke file CSV/JSONL (default stdout)."""
+    for part in iter_export(fmt):
+        output.write(part)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""Load test sederhana untuk lapisan database.
+
+Menjalankan app di server werkzeug multi-thread lalu menembakkan
+request POST (insert) dan GET (list) secara paralel dari beberapa thread.
+
+    python benchmarks/db_load.py --threads 8 --requests 200
+    python benchmarks/db_load.py --threads 8 --requests 200 --write-behind
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def run_clients(url, threads, per_thread, make_request):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for i in range(per_thread):
+            start = time.perf_counter()
+            with urllib.request.urlopen(make_request(url, i)) as resp:
+                resp.read()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def insert_request(url, i):
+    data = urllib.parse.urlencode({
+        "mode": "encrypt", "password": f"Password{i}!", "rail": "3",
+        "nama": f"Mahasiswa {i}", "nim": str(100000 + i), "jk": "Perempuan",
+    }).encode()
+    return urllib.request.Request(url + "/zigzag", data=data)
+
+
+def list_request(url, i):
+    return urllib.request.Request(url + "/zigzag")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="jumlah request per thread")
+    parser.add_argument("--write-behind", action="store_true", help="aktifkan antrean write-behind")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ["MAHASISWA_DB"] = os.path.join(tmpdir, "bench.db")
+    if args.write_behind:
+        os.environ["WRITE_BEHIND"] = "1"
+
+    from werkzeug.serving import make_server
+    import app as kripto
+
+    kripto.init_db()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, kripto.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.port}"
+
+    try:
+        for name, make_request in [("insert", insert_request), ("list", list_request)]:
+            stats = run_clients(url, args.threads, args.requests, make_request)
+            print(f"{name:6s} {stats['requests']:6d} req  {stats['throughput']:8.1f} req/s  "
+                  f"p50 {stats['p50_ms']:6.2f} ms  p99 {stats['p99_ms']:6.2f} ms")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Microbenchmark RSA: pembuatan kunci, enkripsi, dan dekripsi (biasa vs CRT).
+
+    python benchmarks/rsa.py --bits 1024 2048 --size 4096
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import decrypt, encrypt, generate_rsa_key  # noqa: E402
+
+
+def best_of(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[1024, 2048])
+    parser.add_argument("--size", type=int, default=4096, help="panjang plaintext (byte)")
+    args = parser.parse_args()
+
+    plaintext = "Mahasiswa 233307019 " * (args.size // 20 + 1)
+    plaintext = plaintext[:args.size]
+
+    for bits in args.bits:
+        start = time.perf_counter()
+        key = generate_rsa_key(bits)
+        keygen = time.perf_counter() - start
+
+        public = (key.e, key.n)
+        cipher = encrypt(public, plaintext)
+        assert decrypt(key, cipher) == decrypt((key.d, key.n), cipher) == plaintext
+
+        enc = best_of(lambda: encrypt(public, plaintext))
+        dec_plain = best_of(lambda: decrypt((key.d, key.n), cipher))
+        dec_crt = best_of(lambda: decrypt(key, cipher))
+        kib = args.size / 1024
+        print(f"{bits} bit: keygen {keygen * 1000:8.1f} ms  "
+              f"enkripsi {kib / enc:8.1f} KiB/s  "
+              f"dekripsi {kib / dec_plain:6.1f} KiB/s  "
+              f"dekripsi CRT {kib / dec_crt:6.1f} KiB/s ({dec_plain / dec_crt:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
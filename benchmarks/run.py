@@ -0,0 +1,211 @@
+"""Benchmark semua cipher dan request path, hasil disimpan sebagai JSON.
+
+    python benchmarks/run.py -o hasil.json
+    python benchmarks/run.py --quick -o hasil.json
+    python benchmarks/run.py --compare lama.json baru.json
+
+Sweep ukuran input (default 1 B sampai 10 MB), jumlah rail, panjang kunci
+Vigenere, lalu mengukur round-trip Flask test client untuk tiap route
+terhadap tabel mahasiswa berisi --rows baris di database sementara.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [1, 1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+QUICK_SIZES = [1, 1024, 64 * 1024]
+ALPHABET = string.ascii_letters + string.digits + " .,!?#"
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def record(results, name, params, timing, size=None):
+    entry = {"name": name, "params": params, "seconds": timing["min"], "median": timing["median"]}
+    if size:
+        entry["bytes_per_second"] = size / timing["min"] if timing["min"] else None
+    results.append(entry)
+    detail = " ".join(f"{k}={v}" for k, v in params.items())
+    print(f"{name:28s} {detail:32s} {timing['min'] * 1000:10.3f} ms", flush=True)
+
+
+def bench_ciphers(app, results, args, rnd):
+    texts = {size: "".join(rnd.choices(ALPHABET, k=size)) for size in args.sizes}
+
+    for size, text in texts.items():
+        for rail in args.rails:
+            cipher = app.encrypt_rail_fence(text, rail)
+            record(results, "zigzag.encrypt", {"size": size, "rail": rail},
+                   measure(lambda: app.encrypt_rail_fence(text, rail), args.repeat), size)
+            record(results, "zigzag.decrypt", {"size": size, "rail": rail},
+                   measure(lambda: app.decrypt_rail_fence(cipher, rail), args.repeat), size)
+
+        for key_len in args.key_lengths:
+            key = "".join(rnd.choices(string.ascii_uppercase, k=key_len))
+            cipher = app.vigenere_encrypt(text, key)
+            record(results, "vigenere.encrypt", {"size": size, "key_len": key_len},
+                   measure(lambda: app.vigenere_encrypt(text, key), args.repeat), size)
+            record(results, "vigenere.decrypt", {"size": size, "key_len": key_len},
+                   measure(lambda: app.vigenere_decrypt(cipher, key), args.repeat), size)
+
+        cipher = app.encrypt_aes(text, "Kunci#Rahasia1")
+        record(results, "aes.encrypt", {"size": size},
+               measure(lambda: app.encrypt_aes(text, "Kunci#Rahasia1"), args.repeat), size)
+        record(results, "aes.decrypt", {"size": size},
+               measure(lambda: app.decrypt_aes(cipher, "Kunci#Rahasia1"), args.repeat), size)
+
+    key = app.generate_rsa_key(args.rsa_bits)
+    public = (key.e, key.n)
+    for size, text in texts.items():
+        if size > args.rsa_max_size:
+            continue
+        cipher = app.encrypt(public, text)
+        params = {"size": size, "bits": args.rsa_bits}
+        record(results, "rsa.encrypt", params, measure(lambda: app.encrypt(public, text), args.repeat), size)
+        record(results, "rsa.decrypt", params, measure(lambda: app.decrypt(key, cipher), args.repeat), size)
+
+
+def seed_table(app, rows, rnd):
+    conn = app._connect()
+    with conn:
+        conn.execute("DELETE FROM mahasiswa")
+        batch = []
+        for i in range(rows):
+            nama = "".join(rnd.choices(string.ascii_letters, k=8))
+            batch.append((nama, str(233300000 + i), rnd.choice(["Laki-laki", "Perempuan"]),
+                          "".join(rnd.choices(ALPHABET, k=12))))
+            if len(batch) == 10000:
+                conn.executemany(app.INSERT_MAHASISWA, batch)
+                batch = []
+        conn.executemany(app.INSERT_MAHASISWA, batch)
+    conn.close()
+
+
+def bench_routes(app, results, args, rnd):
+    app.init_db()
+    seed_table(app, args.rows, rnd)
+    client = app.app.test_client()
+    forms = {
+        "zigzag": {"rail": "3"},
+        "vigenere": {"key": "KRIPTO"},
+        "aes": {},
+        "rsa": {},
+    }
+    base = {"mode": "encrypt", "password": "Rahasia#2024", "nama": "Bench", "nim": "1", "jk": "Perempuan"}
+    app.get_rsa_key()  # jangan hitung pembuatan kunci RSA
+
+    for route, extra in forms.items():
+        for method in ("GET", "POST"):
+            def request_once():
+                if method == "GET":
+                    resp = client.get(f"/{route}")
+                else:
+                    resp = client.post(f"/{route}", data={**base, **extra})
+                assert resp.status_code == 200, resp.status_code
+
+            request_once()  # pemanasan
+            latencies = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                request_once()
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            entry = {
+                "name": f"route.{route}.{method.lower()}",
+                "params": {"rows": args.rows},
+                "seconds": statistics.median(latencies),
+                "median": statistics.median(latencies),
+                "p95": latencies[max(int(len(latencies) * 0.95) - 1, 0)],
+            }
+            results.append(entry)
+            print(f"{entry['name']:28s} rows={args.rows:<27d} {entry['seconds'] * 1000:10.3f} ms "
+                  f"(p95 {entry['p95'] * 1000:.3f} ms)", flush=True)
+
+
+def result_key(entry):
+    return entry["name"] + json.dumps(entry["params"], sort_keys=True)
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = {result_key(e): e for e in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    for entry in new:
+        before = old.get(result_key(entry))
+        if before is None:
+            continue
+        ratio = before["seconds"] / entry["seconds"] if entry["seconds"] else float("inf")
+        detail = " ".join(f"{k}={v}" for k, v in entry["params"].items())
+        print(f"{entry['name']:28s} {detail:32s} {before['seconds'] * 1000:10.3f} -> "
+              f"{entry['seconds'] * 1000:10.3f} ms  {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="bench_output.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="ukuran input (byte)")
+    parser.add_argument("--rails", type=int, nargs="+", default=[2, 3, 10, 100])
+    parser.add_argument("--key-lengths", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--rsa-bits", type=int, default=2048)
+    parser.add_argument("--rsa-max-size", type=int, default=64 * 1024,
+                        help="ukuran input terbesar untuk RSA (dekripsi lambat)")
+    parser.add_argument("--rows", type=int, default=10000, help="jumlah baris mahasiswa untuk benchmark route")
+    parser.add_argument("--requests", type=int, default=50, help="jumlah request per route")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="ukuran kecil saja, untuk cek cepat")
+    parser.add_argument("--skip-routes", action="store_true")
+    parser.add_argument("--compare", nargs=2, metavar=("LAMA", "BARU"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.quick:
+        args.sizes = QUICK_SIZES
+        args.rsa_bits = 1024
+        args.rows = min(args.rows, 1000)
+        args.requests = min(args.requests, 10)
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ["MAHASISWA_DB"] = os.path.join(tmpdir, "bench.db")
+    os.environ["RSA_KEY_FILE"] = os.path.join(tmpdir, "rsa_key.json")
+    os.environ["RSA_KEY_BITS"] = str(args.rsa_bits)
+    import app
+
+    rnd = random.Random(args.seed)
+    results = []
+    bench_ciphers(app, results, args, rnd)
+    if not args.skip_routes:
+        bench_routes(app, results, args, rnd)
+
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "args": {k: v for k, v in vars(args).items() if k != "compare"},
+    }
+    with open(args.output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"hasil disimpan di {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Membandingkan implementasi Vigenere lama (per karakter) dengan yang baru.
+
+    python benchmarks/vigenere.py --size 1000000 --records 10000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import vigenere_decrypt, vigenere_encrypt, vigenere_encrypt_batch  # noqa: E402
+
+
+def legacy_vigenere_encrypt(plain_text, key):
+    key = key.upper()
+    plain_text = plain_text.upper()
+    cipher_text = ""
+    key_index = 0
+    for char in plain_text:
+        if char.isalpha():
+            shift = ord(key[key_index % len(key)]) - ord('A')
+            cipher_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+            key_index += 1
+        else:
+            cipher_text += char
+    return cipher_text
+
+
+def best_of(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000, help="panjang teks (karakter)")
+    parser.add_argument("--records", type=int, default=10_000, help="jumlah record untuk batch")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    alphabet = string.ascii_letters + string.digits + " .,!"
+    text = "".join(rnd.choice(alphabet) for _ in range(args.size))
+    key = "KRIPTOGRAFI"
+    assert vigenere_encrypt(text, key) == legacy_vigenere_encrypt(text, key)
+    assert vigenere_decrypt(vigenere_encrypt(text, key), key) == text.upper()
+
+    legacy = best_of(lambda: legacy_vigenere_encrypt(text, key))
+    fast = best_of(lambda: vigenere_encrypt(text, key))
+    print(f"teks {args.size} karakter: lama {legacy * 1000:9.1f} ms  baru {fast * 1000:9.1f} ms  "
+          f"({legacy / fast:.1f}x)")
+
+    pairs = [("".join(rnd.choice(alphabet) for _ in range(16)), rnd.choice(["KEY", "KRIPTO", "RAHASIA"]))
+             for _ in range(args.records)]
+    legacy = best_of(lambda: [legacy_vigenere_encrypt(t, k) for t, k in pairs])
+    fast = best_of(lambda: vigenere_encrypt_batch(pairs))
+    print(f"batch {args.records} record:   lama {legacy * 1000:9.1f} ms  baru {fast * 1000:9.1f} ms  "
+          f"({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
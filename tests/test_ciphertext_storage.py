@@ -0,0 +1,94 @@
+"""Uji envelope ciphertext dan migrasi baris teks lama (legacy_to_envelope)."""
+import random
+import sqlite3
+
+import pytest
+
+import app
+from app import (decode_ciphertext, encode_ciphertext, encrypt_aes, legacy_to_envelope,
+                 migrate_ciphertexts, unpack_envelope)
+
+SEED = 20261018
+
+
+def cipher_of(blob):
+    return unpack_envelope(blob)[0]
+
+
+@pytest.mark.parametrize("cipher, value, rail", [
+    ("zigzag", "Hoolelwrd l", 3),
+    ("vigenere", "RIJVS, UYVJN!", None),
+    ("aes", encrypt_aes("Nama: Budi, NIM: 123, JK: L", "kunci"), None),
+    ("rsa", [0, 1, 255, 256, 2 ** 2048 - 1], None),
+    ("text", "apa saja ✓", None),
+])
+def test_encode_decode_round_trip(cipher, value, rail):
+    blob = encode_ciphertext(cipher, value, rail)
+    assert cipher_of(blob) == cipher
+    expected = str(value) if cipher == "rsa" else value
+    assert decode_ciphertext(blob) == expected
+
+
+def test_legacy_rsa_list():
+    value = str([123456789, 42, 7])
+    blob = legacy_to_envelope(value)
+    assert cipher_of(blob) == "rsa"
+    assert decode_ciphertext(blob) == value
+
+
+def test_legacy_rsa_like_text_that_is_not_str_list():
+    # decode akan menulis "[1, 2]", jadi bentuk lain tetap disimpan sebagai teks
+    for value in ("[1,2]", " [1, 2]", "[01, 2]"):
+        blob = legacy_to_envelope(value)
+        assert cipher_of(blob) == "text"
+        assert decode_ciphertext(blob) == value
+
+
+def test_legacy_aes_base64():
+    for plain in ("Nama: Budi, NIM: 123, JK: L", "x" * 100):
+        value = encrypt_aes(plain, "kunci")
+        blob = legacy_to_envelope(value)
+        assert cipher_of(blob) == "aes"
+        assert decode_ciphertext(blob) == value
+
+
+@pytest.mark.parametrize("value", ["Halo dunia", "", "Wrh lo!", "AAAAAAAAAAAAAAAAAAAAAAAA", "[]"])
+def test_legacy_text_passthrough(value):
+    blob = legacy_to_envelope(value)
+    assert cipher_of(blob) == "text"
+    assert decode_ciphertext(blob) == value
+
+
+def test_legacy_alphanumeric_zigzag_is_not_aes():
+    # 64 karakter alfanumerik adalah base64 valid (48 byte = 3 blok AES)
+    value = app.encrypt_rail_fence("Passw0rdYangPanjangSekaliUntukDiujiDenganZigzagAbcdefghijklmnopq", 3)
+    assert len(value) == 64
+    blob = legacy_to_envelope(value)
+    assert cipher_of(blob) == "text"
+    assert decode_ciphertext(blob) == value
+
+
+def test_legacy_random_values_round_trip():
+    rng = random.Random(SEED)
+    alphabet = "ABCDEFabcdef0123456789+/=[], "
+    for _ in range(5000):
+        value = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        assert decode_ciphertext(legacy_to_envelope(value)) == value
+
+
+def test_migrate_ciphertexts(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.app.config, "DATABASE", str(tmp_path / "mahasiswa.db"))
+    app.init_db()
+    legacy = ["Halo dunia", str([5, 6, 7]), encrypt_aes("Nama: Siti", "k"), "Passw0rd" * 8]
+    conn = sqlite3.connect(app.app.config["DATABASE"])
+    conn.executemany(app.INSERT_MAHASISWA, [("n", "1", "L", value) for value in legacy])
+    conn.commit()
+
+    assert migrate_ciphertexts(conn, batch_size=3) == len(legacy)
+    rows = [row[0] for row in conn.execute("SELECT password FROM mahasiswa ORDER BY id")]
+    assert all(isinstance(row, bytes) for row in rows)
+    assert [decode_ciphertext(row) for row in rows] == legacy
+    assert [cipher_of(row) for row in rows] == ["text", "rsa", "aes", "text"]
+    # baris yang sudah berupa envelope tidak disentuh lagi
+    assert migrate_ciphertexts(conn) == 0
+    conn.close()
@@ -0,0 +1,43 @@
+"""Uji pemulihan kunci Vigenere dan jumlah rail dari ciphertext tetap."""
+from app import encrypt_rail_fence, vigenere_encrypt
+from cryptanalysis import index_of_coincidence, rail_fence_candidates, recover_vigenere_key
+
+PLAIN_ID = ("JADI GINI AKU ITU SEBENARNYA ADALAH STRONG WOMAN YANG JATUH DARI LANGIN "
+            "DAN DIBERI KEBEBASAN OLEH TUHAN")
+PLAIN_EN = ("Attack at dawn. The quick brown fox jumps over the lazy dog while the enemy "
+            "sleeps in the valley beyond the river and we wait for the signal from the hill")
+
+
+def test_index_of_coincidence():
+    assert index_of_coincidence("") == 0.0
+    assert index_of_coincidence("AAAA") == 1.0
+    assert index_of_coincidence("ABCD") == 0.0
+
+
+def test_recover_vigenere_key_short_indonesian():
+    # ciphertext pendek (87 huruf): kunci panjang yang overfit punya chi2 kecil,
+    # jadi urutan harus mengikuti skor panjang kunci
+    cipher = vigenere_encrypt(PLAIN_ID, "ZAHRA")
+    assert cipher.startswith("IAKZ GHNP RKT")
+    key, _, plaintext = recover_vigenere_key(cipher, candidates=5)[0]
+    assert key == "ZAHRA"
+    assert plaintext == PLAIN_ID
+
+
+def test_recover_vigenere_key_english():
+    cipher = vigenere_encrypt(PLAIN_EN, "LEMON")
+    key, _, plaintext = recover_vigenere_key(cipher, lang="english")[0]
+    assert key == "LEMON"
+    assert plaintext == PLAIN_EN.upper()
+
+
+def test_recover_vigenere_key_has_no_repeated_keys():
+    keys = [key for key, _, _ in recover_vigenere_key(vigenere_encrypt(PLAIN_EN, "LEMON"), lang="english",
+                                                      candidates=6)]
+    assert len(keys) == len(set(keys))
+
+
+def test_rail_fence_candidates():
+    cipher = encrypt_rail_fence(PLAIN_ID, 7)
+    score, rail, plaintext = rail_fence_candidates(cipher, 20, top=1, workers=1)[0]
+    assert (rail, plaintext) == (7, PLAIN_ID)
@@ -0,0 +1,136 @@
+"""Uji round-trip rail fence dengan input acak (seed tetap supaya bisa diulang)."""
+import random
+
+import pytest
+
+from app import (decrypt_rail_fence, encrypt_rail_fence, iter_decrypt_rail_fence,
+                 iter_encrypt_rail_fence)
+
+SEED = 20261018
+CASES = 2000
+ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,-*\n\téüß€漢字😀"
+
+
+# Implementasi grid sebelum perhitungan aritmetika (dipakai sebagai acuan).
+# '\n' dan '*' dipakai sebagai penanda, jadi hanya benar untuk teks tanpa
+# kedua karakter itu dan key >= 2.
+def old_encrypt_rail_fence(text, key):
+    rail = [['\n' for _ in range(len(text))] for _ in range(key)]
+    dir_down = False
+    row, col = 0, 0
+
+    for char in text:
+        if row == 0 or row == key - 1:
+            dir_down = not dir_down
+        rail[row][col] = char
+        col += 1
+        row += 1 if dir_down else -1
+
+    result = []
+    for i in range(key):
+        for j in range(len(text)):
+            if rail[i][j] != '\n':
+                result.append(rail[i][j])
+    return "".join(result)
+
+
+def old_decrypt_rail_fence(cipher, key):
+    rail = [['\n' for _ in range(len(cipher))] for _ in range(key)]
+    dir_down = None
+    row, col = 0, 0
+
+    for _ in range(len(cipher)):
+        if row == 0:
+            dir_down = True
+        if row == key - 1:
+            dir_down = False
+        rail[row][col] = '*'
+        col += 1
+        row += 1 if dir_down else -1
+
+    index = 0
+    for i in range(key):
+        for j in range(len(cipher)):
+            if rail[i][j] == '*' and index < len(cipher):
+                rail[i][j] = cipher[index]
+                index += 1
+
+    result = []
+    row, col = 0, 0
+    for _ in range(len(cipher)):
+        if row == 0:
+            dir_down = True
+        if row == key - 1:
+            dir_down = False
+        if rail[row][col] != '*':
+            result.append(rail[row][col])
+            col += 1
+        row += 1 if dir_down else -1
+    return "".join(result)
+
+
+def random_text(rng, alphabet=ALPHABET, max_len=200):
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+
+def random_chunks(rng, text):
+    """Memotong text di batas acak, termasuk potongan kosong."""
+    chunks, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(0, 9)
+        chunks.append(text[pos:pos + size])
+        pos += size
+    return chunks
+
+
+@pytest.fixture
+def rng():
+    return random.Random(SEED)
+
+
+def test_round_trip(rng):
+    for _ in range(CASES):
+        text = random_text(rng)
+        key = rng.randint(1, 12)
+        assert decrypt_rail_fence(encrypt_rail_fence(text, key), key) == text, (text, key)
+
+
+def test_chunked_matches_one_shot(rng):
+    for _ in range(CASES):
+        text = random_text(rng)
+        key = rng.randint(1, 12)
+        cipher = encrypt_rail_fence(text, key)
+        assert "".join(iter_encrypt_rail_fence(random_chunks(rng, text), key)) == cipher, (text, key)
+        chunk_size = rng.randint(1, 16)
+        assert "".join(iter_decrypt_rail_fence(cipher, key, chunk_size)) == text, (text, key, chunk_size)
+
+
+def test_matches_old_grid_implementation(rng):
+    alphabet = ALPHABET.replace("\n", "").replace("*", "")
+    for _ in range(CASES):
+        text = random_text(rng, alphabet)
+        key = rng.randint(2, 12)
+        cipher = encrypt_rail_fence(text, key)
+        assert cipher == old_encrypt_rail_fence(text, key), (text, key)
+        assert decrypt_rail_fence(cipher, key) == old_decrypt_rail_fence(cipher, key), (text, key)
+
+
+@pytest.mark.parametrize("key", [0, -1])
+def test_rejects_invalid_rail(key):
+    with pytest.raises(ValueError):
+        encrypt_rail_fence("abc", key)
+    with pytest.raises(ValueError):
+        decrypt_rail_fence("abc", key)
+
+
+def test_huge_rail_count_is_cheap(rng):
+    # key >= len(text) berarti teks tidak berubah; biayanya harus ikut len(text)
+    huge = 10 ** 12
+    assert encrypt_rail_fence("abc", huge) == "abc"
+    assert decrypt_rail_fence("abc", huge) == "abc"
+    for _ in range(200):
+        text = random_text(rng, max_len=300)
+        key = rng.choice([len(text), len(text) + 1, huge])
+        assert encrypt_rail_fence(text, max(key, 1)) == text
+        assert "".join(iter_encrypt_rail_fence(random_chunks(rng, text), huge)) == text
+        assert "".join(iter_decrypt_rail_fence(text, huge, rng.randint(1, 16))) == text